@@ -13,8 +13,11 @@ without having to render the entire screen.
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import islice, repeat
 from operator import itemgetter
-from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, cast
+from typing import TYPE_CHECKING, Collection, Iterable, NamedTuple
 
 import rich.repr
 from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
@@ -23,9 +26,8 @@ from rich.segment import Segment
 from rich.style import Style
 
 from . import errors
-from ._cells import cell_len
+from ._cache import LRUCache
 from ._context import visible_screen_stack
-from ._loop import loop_last
 from .geometry import NULL_OFFSET, Offset, Region, Size
 from .strip import Strip, StripRenderable
 
@@ -74,6 +76,24 @@ class MapGeometry(NamedTuple):
 # Maps a widget on to its geometry (information that describes its position in the composition)
 CompositorMap: TypeAlias = "dict[Widget, MapGeometry]"
 
+# A widget waiting to be placed by _arrange_root
+_StackEntry: TypeAlias = (
+    "tuple[Widget, Region, Region, tuple[tuple[int, int, int], ...], int, Region, bool]"
+)
+
+
+@lru_cache(maxsize=1024)
+def _get_layers_to_index(layers: tuple[str, ...]) -> dict[str, int]:
+    """Get a mapping of layer names on to their index.
+
+    Args:
+        layers: Layer names, in painting order.
+
+    Returns:
+        A dict that maps layer name on to index (should not be modified).
+    """
+    return {layer_name: index for index, layer_name in enumerate(layers)}
+
 
 @rich.repr.auto(angular=True)
 class LayoutUpdate:
@@ -89,11 +109,17 @@ class LayoutUpdate:
         x = self.region.x
         new_line = Segment.line()
         move_to = Control.move_to
-        for last, (y, line) in loop_last(enumerate(self.strips, self.region.y)):
-            yield move_to(x, y)
-            yield from line
-            if not last:
-                yield new_line
+        segments: list[Segment | Control] = []
+        add_segment = segments.append
+        add_segments = segments.extend
+        for y, line in enumerate(self.strips, self.region.y):
+            add_segment(move_to(x, y))
+            add_segments(line)
+            add_segment(new_line)
+        if segments:
+            # Remove the trailing new line
+            segments.pop()
+        yield from segments
 
     def __rich_repr__(self) -> rich.repr.Result:
         yield self.region
@@ -105,14 +131,14 @@ class ChopsUpdate:
 
     def __init__(
         self,
-        chops: list[dict[int, Strip | None]],
+        chops: list[list[Strip | None]],
         spans: list[tuple[int, int, int]],
-        chop_ends: list[list[int]],
+        chop_ends: list[tuple[int, ...]],
     ) -> None:
         """A renderable which updates chops (fragments of lines).
 
         Args:
-            chops: A mapping of offsets to list of segments, per line.
+            chops: A list of strips (or `None` if not updated) for each chop, per line.
             crop: Region to restrict update to.
             chop_ends: A list of the end offsets for each line
         """
@@ -129,42 +155,34 @@ class ChopsUpdate:
         chop_ends = self.chop_ends
         last_y = self.spans[-1][0]
 
-        _cell_len = cell_len
         for y, x1, x2 in self.spans:
             line = chops[y]
             ends = chop_ends[y]
-            for end, (x, strip) in zip(ends, line.items()):
-                # TODO: crop to x extents
-                if strip is None:
-                    continue
-
-                if x > x2 or end <= x1:
-                    continue
-
-                if x2 > x >= x1 and end <= x2:
+            x = 0
+            for end, strip in zip(ends, line):
+                if strip is None or x >= x2 or end <= x1:
+                    pass
+                elif x >= x1 and end <= x2:
                     yield move_to(x, y)
                     yield from strip
-                    continue
-
-                iter_segments = iter(strip)
-                if x < x1:
-                    for segment in iter_segments:
-                        next_x = x + _cell_len(segment.text)
-                        if next_x > x1:
-                            yield move_to(x, y)
-                            yield segment
-                            break
-                        x = next_x
-                else:
-                    yield move_to(x, y)
-                if end <= x2:
-                    yield from iter_segments
                 else:
-                    for segment in iter_segments:
-                        if x >= x2:
-                            break
-                        yield segment
-                        x += _cell_len(segment.text)
+                    # Find the range of segments which overlap the span
+                    segment_ends = strip.segment_ends
+                    first_segment = bisect_right(segment_ends, x1 - x) if x < x1 else 0
+                    if first_segment < len(segment_ends):
+                        # If the chop ends within the span, include any trailing zero width segments
+                        last_segment = (
+                            len(segment_ends)
+                            if end <= x2
+                            else bisect_left(segment_ends, x2 - x) + 1
+                        )
+                        if first_segment:
+                            yield move_to(x + segment_ends[first_segment - 1], y)
+                        else:
+                            yield move_to(x, y)
+                        yield from islice(strip, first_segment, last_segment)
+                # Each chop starts where the previous one ended
+                x = end
 
             if y != last_y:
                 yield new_line
@@ -182,6 +200,12 @@ class Compositor:
 
         self._full_map: CompositorMap = {}
         self._full_map_invalidated = True
+        # Set when the full map contains every widget (not just the visible widgets)
+        self._full_map_complete = False
+        # Set when containers may have scrolled since the full map was arranged
+        self._full_map_scrolled = False
+        # Scroll offsets and stack entries of containers arranged in the full map
+        self._full_map_containers: dict[Widget, tuple[Offset, _StackEntry]] = {}
         self._visible_map: CompositorMap | None = None
         self._layers: list[tuple[Widget, MapGeometry]] | None = None
 
@@ -189,6 +213,9 @@ class Compositor:
         # Note this may be a superset of self.full_map.keys() as some widgets may be invisible for various reasons
         self.widgets: set[Widget] = set()
 
+        # Visible widgets, their region, and clip region in render order
+        self._visible_widget_list: list[tuple[Widget, Region, Region]] | None = None
+
         # Mapping of visible widgets on to their region, and clip region
         self._visible_widgets: dict[Widget, tuple[Region, Region]] | None = None
 
@@ -198,14 +225,50 @@ class Compositor:
         # Dimensions of the arrangement
         self.size = Size(0, 0)
 
+        # The region covered by the arrangement (updated with size)
+        self._screen_region = Region(0, 0, 0, 0)
+
         # The points in each line where the line bisects the left and right edges of the widget
-        self._cuts: list[list[int]] | None = None
+        self._cuts: list[tuple[int, ...]] | None = None
+
+        # The end offsets of the chops in each line (derived from the cuts)
+        self._chop_ends: list[tuple[int, ...]] | None = None
+
+        # An empty chops structure to copy for each render (derived from the cuts)
+        self._chops_template: list[list[Strip | None]] | None = None
 
         # Regions that require an update
         self._dirty_regions: set[Region] = set()
 
-        # Mapping of line numbers on to lists of widget and regions
-        self._layers_visible: list[list[tuple[Widget, Region, Region]]] | None = None
+        # Joined lines, keyed on the identity of the strips in each line's chops.
+        # The cache holds a reference to the strips, so their ids can't be reused.
+        self._join_cache: LRUCache[
+            tuple[int, ...], tuple[tuple[Strip | None, ...], Strip]
+        ] = LRUCache(1024)
+
+        # The last update regions for each widget, with the region, clip, and repaint
+        # regions they were calculated from
+        self._update_regions_cache: dict[
+            Widget, tuple[Region, Region, Collection[Region], list[Region]]
+        ] = {}
+
+        # The last line rendered by get_style_at (widget, region, line offset, and strip)
+        self._style_line: tuple[Widget, Region, int, Strip] | None = None
+
+        # Cropped bounds (y1, y2, x1, x2), widgets, and regions in layers order
+        self._layers_visible: list[
+            tuple[int, int, int, int, Widget, Region]
+        ] | None = None
+
+        # Indexes of the visible layers sorted by their first line, and those lines
+        self._layers_visible_by_y: list[int] = []
+        self._layers_visible_starts: list[int] = []
+
+        # Mapping of line numbers on to the cropped x bounds, widgets, and regions
+        # of the visible layers which cover that line
+        self._layers_visible_lines: dict[
+            int, list[tuple[int, int, Widget, Region]]
+        ] = {}
 
     @classmethod
     def _regions_to_spans(
@@ -220,30 +283,153 @@ class Compositor:
         Returns:
             Yields tuples of (Y, X1, X2).
         """
-        inline_ranges: dict[int, list[tuple[int, int]]] = {}
-        setdefault = inline_ranges.setdefault
+        # Changes to the active spans, keyed by the line where they occur.
+        # A region adds its span on its first line, and removes it after its last line.
+        changes: dict[int, list[tuple[tuple[int, int], int]]] = {}
+        get_changes = changes.setdefault
         for region_x, region_y, width, height in regions:
-            span = (region_x, region_x + width)
-            for y in range(region_y, region_y + height):
-                setdefault(y, []).append(span)
-
-        slice_remaining = slice(1, None)
-        for y, ranges in sorted(inline_ranges.items()):
-            if len(ranges) == 1:
-                # Special case of 1 span
-                yield (y, *ranges[0])
-            else:
-                ranges.sort()
-                x1, x2 = ranges[0]
-                for next_x1, next_x2 in ranges[slice_remaining]:
-                    if next_x1 <= x2:
-                        if next_x2 > x2:
-                            x2 = next_x2
-                    else:
-                        yield (y, x1, x2)
-                        x1 = next_x1
+            if height > 0:
+                span = (region_x, region_x + width)
+                get_changes(region_y, []).append((span, +1))
+                get_changes(region_y + height, []).append((span, -1))
+
+        # Sweep down the lines. Lines between changes have the same spans,
+        # so the spans only need merging once per band of lines.
+        active_spans: dict[tuple[int, int], int] = {}
+        change_lines = sorted(changes)
+        for y, next_y in zip(change_lines, change_lines[1:]):
+            for span, change in changes[y]:
+                count = active_spans.get(span, 0) + change
+                if count:
+                    active_spans[span] = count
+                else:
+                    del active_spans[span]
+            if not active_spans:
+                continue
+
+            # Merge the spans that overlap or touch
+            merged_spans: list[tuple[int, int]] = []
+            iter_spans = iter(sorted(active_spans))
+            x1, x2 = next(iter_spans)
+            for next_x1, next_x2 in iter_spans:
+                if next_x1 <= x2:
+                    if next_x2 > x2:
                         x2 = next_x2
-                yield (y, x1, x2)
+                else:
+                    merged_spans.append((x1, x2))
+                    x1, x2 = next_x1, next_x2
+            merged_spans.append((x1, x2))
+
+            for line_y in range(y, next_y):
+                for x1, x2 in merged_spans:
+                    yield (line_y, x1, x2)
+
+    @classmethod
+    def _coalesce_regions(cls, regions: Iterable[Region]) -> list[Region]:
+        """Merge regions which overlap or touch, to reduce the number of regions to update.
+
+        Regions are only merged if the combined region doesn't cover much more area
+        than the regions it replaces.
+
+        Args:
+            regions: An iterable of Regions.
+
+        Returns:
+            A list of Regions covering (at least) the same area.
+        """
+        coalesced: list[Region] = []
+        add_region = coalesced.append
+        # The total area of the original regions in each coalesced region
+        covered_areas: list[int] = []
+        add_covered_area = covered_areas.append
+        for region in sorted(regions, key=itemgetter(1, 0)):
+            if coalesced:
+                previous_region = coalesced[-1]
+                x, y, width, height = region
+                (
+                    previous_x,
+                    previous_y,
+                    previous_width,
+                    previous_height,
+                ) = previous_region
+                if (
+                    x <= previous_x + previous_width
+                    and previous_x <= x + width
+                    and y <= previous_y + previous_height
+                ):
+                    union_region = previous_region.union(region)
+                    # Merge if the new region is no more than 25% larger than the sum of its parts
+                    covered_area = covered_areas[-1] + region.area
+                    if union_region.area * 4 <= covered_area * 5:
+                        coalesced[-1] = union_region
+                        covered_areas[-1] = covered_area
+                        continue
+            add_region(region)
+            add_covered_area(region.area)
+        return coalesced
+
+    @classmethod
+    def _merge_vertical_regions(cls, regions: list[Region]) -> list[Region]:
+        """Merge regions with the same columns which are stacked on top of each other.
+
+        Unlike [_coalesce_regions][textual._compositor.Compositor._coalesce_regions],
+        this never covers more area than the original regions.
+
+        Args:
+            regions: A list of Regions.
+
+        Returns:
+            A list of Regions covering the same area.
+        """
+        merged: list[Region] = []
+        add_region = merged.append
+        for region in sorted(regions, key=itemgetter(0, 2, 1)):
+            if merged:
+                previous_x, previous_y, previous_width, previous_height = merged[-1]
+                x, y, width, height = region
+                if (
+                    x == previous_x
+                    and width == previous_width
+                    and previous_y <= y <= previous_y + previous_height
+                ):
+                    merged[-1] = Region(
+                        x,
+                        previous_y,
+                        width,
+                        max(previous_y + previous_height, y + height) - previous_y,
+                    )
+                    continue
+            add_region(region)
+        return merged
+
+    @classmethod
+    def _get_map_changes(
+        cls, map: CompositorMap, old_map: CompositorMap
+    ) -> list[tuple[Widget, MapGeometry]]:
+        """Get the widgets and geometry which differ between two compositor maps.
+
+        Args:
+            map: The new compositor map.
+            old_map: The previous compositor map.
+
+        Returns:
+            Widget and geometry for every widget that was added, removed, or updated.
+                Updated widgets are included with both their new and old geometry.
+        """
+        changes: list[tuple[Widget, MapGeometry]] = []
+        add_change = changes.append
+        get_old_geometry = old_map.get
+        for widget, geometry in map.items():
+            old_geometry = get_old_geometry(widget)
+            if old_geometry is None:
+                add_change((widget, geometry))
+            elif old_geometry is not geometry and old_geometry != geometry:
+                add_change((widget, geometry))
+                add_change((widget, old_geometry))
+        for widget, old_geometry in old_map.items():
+            if widget not in map:
+                add_change((widget, old_geometry))
+        return changes
 
     def __rich_repr__(self) -> rich.repr.Result:
         yield "size", self.size
@@ -260,33 +446,48 @@ class Compositor:
             Hidden, shown, and resized widgets.
         """
         self._cuts = None
+        self._chop_ends = None
+        self._chops_template = None
         self._layers = None
         self._layers_visible = None
+        self._style_line = None
+        self._visible_widget_list = None
         self._visible_widgets = None
         self._visible_map = None
+        self._update_regions_cache.clear()
         self.root = parent
         self.size = size
+        self._screen_region = size.region
 
         # Keep a copy of the old map because we're going to compare it with the update
         old_map = self._full_map
         old_widgets = old_map.keys()
 
-        map, widgets = self._arrange_root(parent, size)
+        map, widgets, containers = self._arrange_root(parent, size)
+
+        # The new map only contains visible widgets, so the full map can no longer
+        # be updated incrementally if containers have scrolled
+        self._full_map_invalidated = (
+            self._full_map_invalidated or self._full_map_scrolled
+        )
+        self._full_map_scrolled = False
+        self._full_map_complete = False
 
         new_widgets = map.keys()
 
         # Replace map and widgets
         self._full_map = map
+        self._full_map_containers = containers
         self.widgets = widgets
 
         # Contains widgets + geometry for every widget that changed (added, removed, or updated)
-        changes = map.items() ^ old_map.items()
+        changes = self._get_map_changes(map, old_map)
 
         # Widgets in both new and old
         common_widgets = old_widgets & new_widgets
 
         # Mark dirty regions.
-        screen_region = size.region
+        screen_region = self._screen_region
         if screen_region not in self._dirty_regions:
             regions = {
                 region
@@ -327,18 +528,27 @@ class Compositor:
 
         """
         self._cuts = None
+        self._chop_ends = None
+        self._chops_template = None
         self._layers = None
         self._layers_visible = None
+        self._style_line = None
+        self._visible_widget_list = None
         self._visible_widgets = None
-        self._full_map_invalidated = True
+        if self._full_map_complete:
+            self._full_map_scrolled = True
+        else:
+            # Only a complete map may be updated incrementally
+            self._full_map_invalidated = True
         self.root = parent
         self.size = size
+        self._screen_region = size.region
 
         # Keep a copy of the old map because we're going to compare it with the update
         old_map = (
             self._visible_map if self._visible_map is not None else self._full_map or {}
         )
-        map, widgets = self._arrange_root(parent, size, visible_only=True)
+        map, widgets, _containers = self._arrange_root(parent, size, visible_only=True)
 
         # Replace map and widgets
         self._visible_map = map
@@ -347,10 +557,10 @@ class Compositor:
         exposed_widgets = map.keys() - old_map.keys()
 
         # Contains widgets + geometry for every widget that changed (added, removed, or updated)
-        changes = map.items() ^ old_map.items()
+        changes = self._get_map_changes(map, old_map)
 
         # Mark dirty regions.
-        screen_region = size.region
+        screen_region = self._screen_region
         if screen_region not in self._dirty_regions:
             regions = {
                 region
@@ -372,13 +582,51 @@ class Compositor:
             return {}
         if self._full_map_invalidated:
             self._full_map_invalidated = False
-            map, _widgets = self._arrange_root(self.root, self.size, visible_only=False)
+            self._full_map_scrolled = False
+            self._full_map_complete = True
+            map, _widgets, containers = self._arrange_root(
+                self.root, self.size, visible_only=False
+            )
             self._full_map = map
+            self._full_map_containers = containers
+            self._visible_widget_list = None
             self._visible_widgets = None
             self._visible_map = None
+        elif self._full_map_scrolled:
+            self._full_map_scrolled = False
+            self._arrange_scrolled_containers()
 
         return self._full_map
 
+    def _arrange_scrolled_containers(self) -> None:
+        """Update the full map for containers which have scrolled since they were arranged.
+
+        Scrolling moves the descendants of a container, but doesn't change anything else,
+        so only the scrolled containers need to be arranged again.
+        """
+        assert self.root is not None
+        containers = self._full_map_containers
+        # Includes invisible containers, which may have visible children
+        scrolled_containers = {
+            widget
+            for widget, (scroll_offset, _stack_entry) in containers.items()
+            if widget.scroll_offset != scroll_offset
+        }
+        if not scrolled_containers:
+            return
+        # Arranging a container also arranges its descendants,
+        # so we only need to arrange the outer-most scrolled containers
+        subtrees = [
+            containers[widget][1]
+            for widget in scrolled_containers
+            if scrolled_containers.isdisjoint(widget.ancestors)
+        ]
+        map, _widgets, new_containers = self._arrange_root(
+            self.root, self.size, visible_only=False, subtrees=subtrees
+        )
+        self._full_map.update(map)
+        containers.update(new_containers)
+
     @property
     def visible_widgets(self) -> dict[Widget, tuple[Region, Region]]:
         """Get a mapping of widgets on to region and clip.
@@ -386,70 +634,145 @@ class Compositor:
         Returns:
             Visible widget mapping.
         """
-
         if self._visible_widgets is None:
+            self._visible_widgets = {
+                widget: (region, clip)
+                for widget, region, clip in self.visible_widget_list
+            }
+        return self._visible_widgets
+
+    @property
+    def visible_widget_list(self) -> list[tuple[Widget, Region, Region]]:
+        """Get visible widgets with their region and clip, in render order.
+
+        Cheaper than `visible_widgets` for callers which only iterate, as
+        there is no need to hash every widget.
+
+        Returns:
+            List of (WIDGET, REGION, CLIP) tuples.
+        """
+
+        if self._visible_widget_list is None:
             map = (
                 self._visible_map
                 if self._visible_map is not None
                 else (self._full_map or {})
             )
-            screen = self.size.region
-            in_screen = screen.overlaps
-            overlaps = Region.overlaps
+            screen_width, screen_height = self.size
 
             # Widgets and regions in render order
-            visible_widgets = [
-                (order, widget, region, clip)
-                for widget, (region, order, clip, _, _, _) in map.items()
-                if in_screen(region) and overlaps(clip, region)
-            ]
+            visible_widgets: list[
+                tuple[tuple[tuple[int, int, int], ...], Widget, Region, Region]
+            ] = []
+            add_visible_widget = visible_widgets.append
+
+            # Unrolled equivalent of `screen.overlaps(region) and clip.overlaps(region)`,
+            # because this is calculated for every widget in the map
+            for widget, (region, order, clip, _, _, _) in map.items():
+                x1, y1, width, height = region
+                x2 = x1 + width
+                y2 = y1 + height
+                if not (
+                    (
+                        (screen_width > x1 >= 0)
+                        or (screen_width > x2 > 0)
+                        or (x1 < 0 and x2 >= screen_width)
+                    )
+                    and (
+                        (screen_height > y1 >= 0)
+                        or (screen_height > y2 > 0)
+                        or (y1 < 0 and y2 >= screen_height)
+                    )
+                ):
+                    continue
+                clip_x1, clip_y1, clip_width, clip_height = clip
+                clip_x2 = clip_x1 + clip_width
+                clip_y2 = clip_y1 + clip_height
+                if (
+                    (clip_x2 > x1 >= clip_x1)
+                    or (clip_x2 > x2 > clip_x1)
+                    or (x1 < clip_x1 and x2 >= clip_x2)
+                ) and (
+                    (clip_y2 > y1 >= clip_y1)
+                    or (clip_y2 > y2 > clip_y1)
+                    or (y1 < clip_y1 and y2 >= clip_y2)
+                ):
+                    add_visible_widget((order, widget, region, clip))
+
             visible_widgets.sort(key=itemgetter(0), reverse=True)
-            self._visible_widgets = {
-                widget: (region, clip) for _, widget, region, clip in visible_widgets
-            }
-        return self._visible_widgets
+            self._visible_widget_list = [
+                (widget, region, clip) for _, widget, region, clip in visible_widgets
+            ]
+        return self._visible_widget_list
 
     def _arrange_root(
-        self, root: Widget, size: Size, visible_only: bool = True
-    ) -> tuple[CompositorMap, set[Widget]]:
+        self,
+        root: Widget,
+        size: Size,
+        visible_only: bool = True,
+        subtrees: Iterable[_StackEntry] | None = None,
+    ) -> tuple[CompositorMap, set[Widget], dict[Widget, tuple[Offset, _StackEntry]]]:
         """Arrange a widget's children based on its layout attribute.
 
         Args:
             root: Top level widget.
+            size: Size of the area to be filled.
+            visible_only: Only arrange children which are visible within their container.
+            subtrees: Stack entries of containers to arrange (rather than starting
+                from the root), or `None` to arrange from the root.
 
         Returns:
-            Compositor map and set of widgets.
+            Compositor map, set of widgets, and the scroll offset and stack entry
+                of arranged containers.
         """
 
         ORIGIN = NULL_OFFSET
+        _MapGeometry = MapGeometry
+        _Region = Region
+        _Size = Size
 
         map: CompositorMap = {}
         widgets: set[Widget] = set()
         add_new_widget = widgets.add
-        layer_order: int = 0
-
-        def add_widget(
-            widget: Widget,
-            virtual_region: Region,
-            region: Region,
-            order: tuple[tuple[int, int, int], ...],
-            layer_order: int,
-            clip: Region,
-            visible: bool,
-            _MapGeometry: type[MapGeometry] = MapGeometry,
-        ) -> None:
-            """Called recursively to place a widget and its children in the map.
-
-            Args:
-                widget: The widget to add.
-                virtual_region: The Widget region relative to it's container.
-                region: The region the widget will occupy.
-                order: Painting order information.
-                layer_order: The order of the widget in its layer.
-                clip: The clipping region (i.e. the viewport which contains it).
-                visible: Whether the widget should be visible by default.
-                    This may be overridden by the CSS rule `visibility`.
-            """
+        containers: dict[Widget, tuple[Offset, _StackEntry]] = {}
+
+        # A stack of widgets to place in the map.
+        # Each entry contains a widget, virtual region (relative to it's container),
+        # region, painting order, order within its layer, clip region, and visibility.
+        # Visibility may be overridden by the CSS rule `visibility`.
+        stack: list[_StackEntry] = []
+        push_widgets = stack.extend
+        pop_widget = stack.pop
+
+        if subtrees is None:
+            # Add top level (root) widget
+            stack.append(
+                (
+                    root,
+                    size.region,
+                    size.region,
+                    ((0, 0, 0),),
+                    0,
+                    size.region,
+                    True,
+                )
+            )
+        else:
+            # Add containers (and their children) as they were previously arranged
+            push_widgets(subtrees)
+
+        while stack:
+            stack_entry = pop_widget()
+            (
+                widget,
+                virtual_region,
+                region,
+                order,
+                layer_order,
+                clip,
+                visible,
+            ) = stack_entry
+
             visibility = widget.styles.get_rule("visibility")
             if visibility is not None:
                 visible = visibility == "visible"
@@ -462,12 +785,20 @@ class Compositor:
                 if styles_offset
                 else ORIGIN
             )
+            layout_x, layout_y = layout_offset
+            region_x, region_y, region_width, region_height = region
 
             # Container region is minus border
-            container_region = region.shrink(widget.styles.gutter).translate(
-                layout_offset
+            gutter_top, gutter_right, gutter_bottom, gutter_left = widget.styles.gutter
+            container_size = _Size(
+                max(0, region_width - (gutter_left + gutter_right)),
+                max(0, region_height - (gutter_top + gutter_bottom)),
+            )
+            container_region = _Region(
+                region_x + gutter_left + layout_x,
+                region_y + gutter_top + layout_y,
+                *container_size,
             )
-            container_size = container_region.size
 
             # Widgets with scrollbars (containers or scroll view) require additional processing
             if widget.is_scrollable:
@@ -486,56 +817,103 @@ class Compositor:
                     arranged_widgets = arrange_result.widgets
                     widgets.update(arranged_widgets)
 
+                    scroll_offset = widget.scroll_offset
+                    containers[widget] = (scroll_offset, stack_entry)
                     if visible_only:
                         placements = arrange_result.get_visible_placements(
-                            container_size.region + widget.scroll_offset
+                            container_size.region + scroll_offset
                         )
                     else:
                         placements = arrange_result.placements
                     total_region = total_region.union(arrange_result.total_region)
 
                     # An offset added to all placements
-                    placement_offset = container_region.offset
-                    placement_scroll_offset = placement_offset - widget.scroll_offset
+                    offset_x, offset_y, _, _ = container_region
+                    scroll_x, scroll_y = scroll_offset
+                    scroll_offset_x = offset_x - scroll_x
+                    scroll_offset_y = offset_y - scroll_y
+
+                    get_layer_index = _get_layers_to_index(widget.layers).get
 
-                    _layers = widget.layers
-                    layers_to_index = {
-                        layer_name: index for index, layer_name in enumerate(_layers)
-                    }
-                    get_layer_index = layers_to_index.get
+                    layer_indexes = [
+                        get_layer_index(placement.widget.layer, 0)
+                        for placement in placements
+                    ]
 
-                    scroll_spacing = arrange_result.scroll_spacing
+                    (
+                        scroll_top,
+                        scroll_right,
+                        scroll_bottom,
+                        scroll_left,
+                    ) = arrange_result.scroll_spacing
+
+                    # Corners of the region covered by children
+                    total_x1, total_y1, total_x2, total_y2 = total_region.corners
 
                     # Add all the widgets
-                    for sub_region, margin, sub_widget, z, fixed in reversed(
-                        placements
+                    sub_widgets: list[_StackEntry] = []
+                    add_sub_widget = sub_widgets.append
+                    for (sub_region, margin, sub_widget, z, fixed), layer_index in zip(
+                        reversed(placements), reversed(layer_indexes)
                     ):
-                        layer_index = get_layer_index(sub_widget.layer, 0)
+                        sub_x, sub_y, sub_width, sub_height = sub_region
                         # Combine regions with children to calculate the "virtual size"
                         if fixed:
-                            widget_region = sub_region + placement_offset
+                            widget_region = _Region(
+                                sub_x + offset_x,
+                                sub_y + offset_y,
+                                sub_width,
+                                sub_height,
+                            )
                         else:
-                            total_region = total_region.union(
-                                sub_region.grow(
-                                    margin if layer_index else margin + scroll_spacing
-                                )
+                            top, right, bottom, left = margin
+                            if not layer_index:
+                                top += scroll_top
+                                right += scroll_right
+                                bottom += scroll_bottom
+                                left += scroll_left
+                            x1 = sub_x - left
+                            y1 = sub_y - top
+                            x2 = x1 + max(0, sub_width + left + right)
+                            y2 = y1 + max(0, sub_height + top + bottom)
+                            if x1 < total_x1:
+                                total_x1 = x1
+                            if y1 < total_y1:
+                                total_y1 = y1
+                            if x2 > total_x2:
+                                total_x2 = x2
+                            if y2 > total_y2:
+                                total_y2 = y2
+                            widget_region = _Region(
+                                sub_x + scroll_offset_x,
+                                sub_y + scroll_offset_y,
+                                sub_width,
+                                sub_height,
                             )
-                            widget_region = sub_region + placement_scroll_offset
 
                         widget_order = order + ((layer_index, z, layer_order),)
 
-                        add_widget(
-                            sub_widget,
-                            sub_region,
-                            widget_region,
-                            widget_order,
-                            layer_order,
-                            sub_clip,
-                            visible,
+                        add_sub_widget(
+                            (
+                                sub_widget,
+                                sub_region,
+                                widget_region,
+                                widget_order,
+                                layer_order,
+                                sub_clip,
+                                visible,
+                            )
                         )
 
                         layer_order -= 1
 
+                    total_region = _Region(
+                        total_x1, total_y1, total_x2 - total_x1, total_y2 - total_y1
+                    )
+
+                    # Reversed, so that children are placed in the same order as they were added
+                    push_widgets(reversed(sub_widgets))
+
                 if visible:
                     # Add any scrollbars
                     if any(widget.scrollbars_enabled):
@@ -552,7 +930,12 @@ class Compositor:
                             )
 
                     map[widget] = _MapGeometry(
-                        region + layout_offset,
+                        _Region(
+                            region_x + layout_x,
+                            region_y + layout_y,
+                            region_width,
+                            region_height,
+                        ),
                         order,
                         clip,
                         total_region.size,
@@ -563,7 +946,12 @@ class Compositor:
             elif visible:
                 # Add the widget to the map
                 map[widget] = _MapGeometry(
-                    region + layout_offset,
+                    _Region(
+                        region_x + layout_x,
+                        region_y + layout_y,
+                        region_width,
+                        region_height,
+                    ),
                     order,
                     clip,
                     region.size,
@@ -571,17 +959,7 @@ class Compositor:
                     virtual_region,
                 )
 
-        # Add top level (root) widget
-        add_widget(
-            root,
-            size.region,
-            size.region,
-            ((0, 0, 0),),
-            layer_order,
-            size.region,
-            True,
-        )
-        return map, widgets
+        return map, widgets, containers
 
     @property
     def layers(self) -> list[tuple[Widget, MapGeometry]]:
@@ -594,25 +972,73 @@ class Compositor:
         return self._layers
 
     @property
-    def layers_visible(self) -> list[list[tuple[Widget, Region, Region]]]:
-        """Visible widgets and regions in layers order."""
+    def layers_visible(self) -> list[tuple[int, int, int, int, Widget, Region]]:
+        """Visible widgets and regions in layers order.
+
+        Each layer is a tuple of the bounds of the region cropped by its clip
+        (y1, y2, x1, x2), the widget, and its region. Bounds are stored as plain
+        integers so that hit tests don't need to unpack regions.
+        """
 
         if self._layers_visible is None:
-            layers_visible: list[list[tuple[Widget, Region, Region]]]
-            layers_visible = [[] for y in range(self.size.height)]
-            layers_visible_appends = [layer.append for layer in layers_visible]
-            intersection = Region.intersection
-            _range = range
-            for widget, (region, clip) in self.visible_widgets.items():
-                cropped_region = intersection(region, clip)
-                _x, region_y, _width, region_height = cropped_region
-                if region_height:
-                    widget_location = (widget, cropped_region, region)
-                    for y in _range(region_y, region_y + region_height):
-                        layers_visible_appends[y](widget_location)
+            layers_visible: list[tuple[int, int, int, int, Widget, Region]] = []
+            add_layer = layers_visible.append
+            for widget, region, clip in self.visible_widget_list:
+                # Inlined Region.intersection
+                x1, y1, width, height = region
+                clip_x1, clip_y1, clip_width, clip_height = clip
+                x2 = x1 + width
+                y2 = y1 + height
+                clip_x2 = clip_x1 + clip_width
+                clip_y2 = clip_y1 + clip_height
+                crop_y1 = clip_y2 if y1 > clip_y2 else (clip_y1 if y1 < clip_y1 else y1)
+                crop_y2 = clip_y2 if y2 > clip_y2 else (clip_y1 if y2 < clip_y1 else y2)
+                if crop_y2 == crop_y1:
+                    continue
+                crop_x1 = clip_x2 if x1 > clip_x2 else (clip_x1 if x1 < clip_x1 else x1)
+                crop_x2 = clip_x2 if x2 > clip_x2 else (clip_x1 if x2 < clip_x1 else x2)
+                add_layer((crop_y1, crop_y2, crop_x1, crop_x2, widget, region))
+            self._layers_visible_by_y = sorted(
+                range(len(layers_visible)), key=lambda index: layers_visible[index][0]
+            )
+            self._layers_visible_starts = [
+                layers_visible[index][0] for index in self._layers_visible_by_y
+            ]
+            self._layers_visible_lines.clear()
             self._layers_visible = layers_visible
         return self._layers_visible
 
+    def _get_layers_at_line(self, y: int) -> list[tuple[int, int, Widget, Region]]:
+        """Get the visible layers which cover a given line.
+
+        Lines are calculated on demand, and cached until the next reflow.
+
+        Args:
+            y: Y coordinate.
+
+        Returns:
+            Cropped x bounds (x1, x2), widgets, and regions in layers order.
+        """
+        layers_visible = self.layers_visible
+        try:
+            return self._layers_visible_lines[y]
+        except KeyError:
+            pass
+        if self.size.height > y >= 0:
+            # Only layers starting on or above this line can cover it
+            candidates = self._layers_visible_by_y[
+                : bisect_right(self._layers_visible_starts, y)
+            ]
+            # Restore layers order, and drop layers which end above this line
+            indexes = sorted(
+                [index for index in candidates if layers_visible[index][1] > y]
+            )
+            layers = [layers_visible[index][2:] for index in indexes]
+        else:
+            layers = []
+        self._layers_visible_lines[y] = layers
+        return layers
+
     def get_offset(self, widget: Widget) -> Offset:
         """Get the offset of a widget."""
         try:
@@ -639,11 +1065,10 @@ class Compositor:
             A tuple of the widget and its region.
         """
 
-        contains = Region.contains
-        if len(self.layers_visible) > y >= 0:
-            for widget, cropped_region, region in self.layers_visible[y]:
-                if contains(cropped_region, x, y) and widget.visible:
-                    return widget, region
+        for x1, x2, widget, region in self._get_layers_at_line(y):
+            # Layers at this line already contain y, so only x needs checking
+            if x1 <= x < x2 and widget.visible:
+                return widget, region
         raise errors.NoWidget(f"No widget under screen coordinate ({x}, {y})")
 
     def get_widgets_at(self, x: int, y: int) -> Iterable[tuple[Widget, Region]]:
@@ -656,9 +1081,9 @@ class Compositor:
         Returns:
             Sequence of (WIDGET, REGION) tuples.
         """
-        contains = Region.contains
-        for widget, cropped_region, region in self.layers_visible[y]:
-            if contains(cropped_region, x, y) and widget.visible:
+        for x1, x2, widget, region in self._get_layers_at_line(y):
+            # Layers at this line already contain y, so only x needs checking
+            if x1 <= x < x2 and widget.visible:
                 yield widget, region
 
     def get_style_at(self, x: int, y: int) -> Style:
@@ -681,16 +1106,26 @@ class Compositor:
         x -= region.x
         y -= region.y
 
-        visible_screen_stack.set(widget.app._background_screens)
-        lines = widget.render_lines(Region(0, y, region.width, 1))
-
-        if not lines:
-            return Style.null()
-        end = 0
-        for segment in lines[0]:
-            end += segment.cell_length
-            if x < end:
-                return segment.style or Style.null()
+        style_line = self._style_line
+        if (
+            style_line is not None
+            and style_line[:3] == (widget, region, y)
+            and not widget._repaint_regions
+        ):
+            # Cached line is valid if the widget hasn't been refreshed since
+            line = style_line[3]
+        else:
+            visible_screen_stack.set(widget.app._background_screens)
+            lines = widget.render_lines(Region(0, y, region.width, 1))
+            if not lines:
+                return Style.null()
+            line = lines[0]
+            self._style_line = (widget, region, y, line)
+
+        segment_ends = line.segment_ends
+        segment_index = bisect_right(segment_ends, x)
+        if segment_index < len(segment_ends):
+            return line[segment_index].style or Style.null()
         return Style.null()
 
     def find_widget(self, widget: Widget) -> MapGeometry:
@@ -726,47 +1161,88 @@ class Compositor:
             return region
 
     @property
-    def cuts(self) -> list[list[int]]:
+    def cuts(self) -> list[tuple[int, ...]]:
         """Get vertical cuts.
 
         A cut is every point on a line where a widget starts or ends.
 
         Returns:
-            A list of cuts for every line.
+            A list of cuts for every line (lines may share the same tuple).
         """
         if self._cuts is not None:
             return self._cuts
 
         width, height = self.size
-        screen_region = self.size.region
-        cuts = [[0, width] for _ in range(height)]
+        screen_region = self._screen_region
 
+        # Changes to the cuts, keyed by the line where they occur.
+        # A region adds its cuts on its first line, and removes them after its last line.
+        cut_changes: dict[int, list[tuple[int, int]]] = {}
+        get_changes = cut_changes.setdefault
         intersection = Region.intersection
-        extend = list.extend
 
-        for region, clip in self.visible_widgets.values():
+        for _, region, clip in self.visible_widget_list:
             region = intersection(region, clip)
             if region and (region in screen_region):
                 x, y, region_width, region_height = region
-                region_cuts = (x, x + region_width)
-                for cut in cuts[y : y + region_height]:
-                    extend(cut, region_cuts)
-
-        # Sort the cuts for each line
-        self._cuts = [sorted(set(line_cuts)) for line_cuts in cuts]
+                x2 = x + region_width
+                get_changes(y, []).extend(((x, +1), (x2, +1)))
+                get_changes(y + region_height, []).extend(((x, -1), (x2, -1)))
+
+        # Sweep down the lines, counting the regions which reference each cut.
+        # Lines between changes share the same (sorted) tuple of cuts.
+        cut_counts: dict[int, int] = {0: 1, width: 1}
+        line_cuts: tuple[int, ...] = (0, width)
+        cuts: list[tuple[int, ...]] = []
+        append_cuts = cuts.append
+        for y in range(height):
+            changes = cut_changes.get(y)
+            if changes is not None:
+                for cut, change in changes:
+                    count = cut_counts.get(cut, 0) + change
+                    if count:
+                        cut_counts[cut] = count
+                    else:
+                        del cut_counts[cut]
+                line_cuts = tuple(sorted(cut_counts))
+            append_cuts(line_cuts)
 
+        self._cuts = cuts
         return self._cuts
 
+    @property
+    def chop_ends(self) -> list[tuple[int, ...]]:
+        """Get the end offsets of the chops in every line.
+
+        Returns:
+            A list of chop ends for every line (lines may share the same tuple).
+        """
+        if self._chop_ends is None:
+            chop_ends: list[tuple[int, ...]] = []
+            append_ends = chop_ends.append
+            previous_cuts: tuple[int, ...] = ()
+            line_ends: tuple[int, ...] = ()
+            for line_cuts in self.cuts:
+                # Lines with the same cuts can share the same ends
+                if line_cuts is not previous_cuts:
+                    previous_cuts = line_cuts
+                    line_ends = line_cuts[1:]
+                append_ends(line_ends)
+            self._chop_ends = chop_ends
+        return self._chop_ends
+
     def _get_renders(
         self, crop: Region | None = None
-    ) -> Iterable[tuple[Region, Region, list[Strip]]]:
+    ) -> Iterable[tuple[Region, list[Strip]]]:
         """Get rendered widgets (lists of segments) in the composition.
 
+        Widgets which are entirely clipped are skipped.
+
         Args:
             crop: Region to crop to, or `None` for entire screen.
 
         Returns:
-            An iterable of <region>, <clip region>, and <strips>
+            An iterable of <render region> (region cropped to its clip) and <strips>
         """
         # If a renderable throws an error while rendering, the user likely doesn't care about the traceback
         # up to this point.
@@ -774,40 +1250,28 @@ class Compositor:
 
         _Region = Region
 
-        visible_widgets = self.visible_widgets
+        visible_widgets = self.visible_widget_list
 
         if crop:
             crop_overlaps = crop.overlaps
             widget_regions = [
                 (widget, region, clip)
-                for widget, (region, clip) in visible_widgets.items()
+                for widget, region, clip in visible_widgets
                 if crop_overlaps(clip) and widget.styles.opacity > 0
             ]
         else:
             widget_regions = [
                 (widget, region, clip)
-                for widget, (region, clip) in visible_widgets.items()
+                for widget, region, clip in visible_widgets
                 if widget.styles.opacity > 0
             ]
 
-        intersection = _Region.intersection
-        contains_region = _Region.contains_region
+        clip_crop = _Region.clip_crop
 
         for widget, region, clip in widget_regions:
-            if contains_region(clip, region):
-                yield region, clip, widget.render_lines(
-                    _Region(0, 0, region.width, region.height)
-                )
-            else:
-                clipped_region = intersection(region, clip)
-                if not clipped_region:
-                    continue
-                new_x, new_y, new_width, new_height = clipped_region
-                delta_x = new_x - region.x
-                delta_y = new_y - region.y
-                yield region, clip, widget.render_lines(
-                    _Region(delta_x, delta_y, new_width, new_height)
-                )
+            render_region, crop = clip_crop(region, clip)
+            if render_region:
+                yield render_region, widget.render_lines(crop)
 
     def render_update(
         self, full: bool = False, screen_stack: list[Screen] | None = None
@@ -821,8 +1285,10 @@ class Compositor:
             A renderable for the update, or `None` if no update was required.
         """
 
+        if not full and not self._dirty_regions:
+            return None
         visible_screen_stack.set([] if screen_stack is None else screen_stack)
-        screen_region = self.size.region
+        screen_region = self._screen_region
         if full or screen_region in self._dirty_regions:
             return self.render_full_update()
         else:
@@ -834,11 +1300,11 @@ class Compositor:
         Returns:
             A LayoutUpdate renderable.
         """
-        screen_region = self.size.region
+        screen_region = self._screen_region
         self._dirty_regions.clear()
         crop = screen_region
-        chops = self._render_chops(crop, lambda y: True)
-        render_strips = [Strip.join(chop.values()) for chop in chops]
+        chops = self._render_chops(crop)
+        render_strips = self._join_chops(chops)
         return LayoutUpdate(render_strips, screen_region)
 
     def render_partial_update(self) -> ChopsUpdate | None:
@@ -848,19 +1314,18 @@ class Compositor:
             A ChopsUpdate if there is anything to update, otherwise `None`.
 
         """
-        screen_region = self.size.region
-        update_regions = self._dirty_regions.copy()
-        self._dirty_regions.clear()
+        screen_region = self._screen_region
+        update_regions = self._dirty_regions
+        self._dirty_regions = set()
         if update_regions:
             # Create a crop region that surrounds all updates.
             crop = Region.from_union(update_regions).intersection(screen_region)
-            spans = list(self._regions_to_spans(update_regions))
-            is_rendered_line = {y for y, _, _ in spans}.__contains__
+            spans = list(self._regions_to_spans(self._coalesce_regions(update_regions)))
+            rendered_lines = set(map(itemgetter(0), spans))
         else:
             return None
-        chops = self._render_chops(crop, is_rendered_line)
-        chop_ends = [cut_set[1:] for cut_set in self.cuts]
-        return ChopsUpdate(chops, spans, chop_ends)
+        chops = self._render_chops(crop, rendered_lines)
+        return ChopsUpdate(chops, spans, self.chop_ends)
 
     def render_strips(self) -> list[Strip]:
         """Render to a list of strips.
@@ -868,61 +1333,128 @@ class Compositor:
         Returns:
             A list of strips with the screen content.
         """
-        chops = self._render_chops(self.size.region, lambda y: True)
-        render_strips = [Strip.join(chop.values()) for chop in chops]
+        chops = self._render_chops(self._screen_region)
+        render_strips = self._join_chops(chops)
         return render_strips
 
+    def _join_chops(self, chops: list[list[Strip | None]]) -> list[Strip]:
+        """Join chops in to a strip per line.
+
+        Lines which consist of the same strips as a previous render reuse the joined strip.
+
+        Args:
+            chops: Chops structure.
+
+        Returns:
+            A list of strips.
+        """
+        join_cache = self._join_cache
+        get_joined = join_cache.get
+        join = Strip.join
+        strips: list[Strip] = []
+        add_strip = strips.append
+        for chop in chops:
+            key = tuple(map(id, chop))
+            cached = get_joined(key)
+            if cached is None:
+                line_strips = tuple(chop)
+                strip = join(line_strips)
+                join_cache[key] = (line_strips, strip)
+            else:
+                strip = cached[1]
+            add_strip(strip)
+        return strips
+
     def _render_chops(
         self,
         crop: Region,
-        is_rendered_line: Callable[[int], bool],
-    ) -> list[dict[int, Strip | None]]:
+        rendered_lines: set[int] | None = None,
+    ) -> list[list[Strip | None]]:
         """Render update 'chops'.
 
         Args:
             crop: Region to crop to.
-            is_rendered_line: Callable to check if line should be rendered.
+            rendered_lines: Set of lines to render, or `None` to render all lines.
 
         Returns:
-            Chops structure.
+            Chops structure (a list of strips per line, with one slot per pair of cuts).
         """
         cuts = self.cuts
-        fromkeys = cast("Callable[[list[int]], dict[int, Strip | None]]", dict.fromkeys)
-        chops: list[dict[int, Strip | None]]
-        chops = [fromkeys(cut_set[:-1]) for cut_set in cuts]
-
-        cut_strips: Iterable[Strip]
+        if self._chops_template is None:
+            chops_template: list[list[Strip | None]] = []
+            template_cuts: tuple[int, ...] | None = None
+            empty_row: list[Strip | None] = []
+            for cut_set in cuts:
+                # Lines with the same cuts can share a template row
+                if cut_set is not template_cuts:
+                    template_cuts = cut_set
+                    empty_row = [None] * (len(cut_set) - 1)
+                chops_template.append(empty_row)
+            self._chops_template = chops_template
+        chops: list[list[Strip | None]] = list(map(list.copy, self._chops_template))
+
+        _bisect_left = bisect_left
+        _bisect_right = bisect_right
 
         # Go through all the renders in reverse order and fill buckets with no render
         renders = self._get_renders(crop)
-        intersection = Region.intersection
 
-        for region, clip, strips in renders:
-            render_region = intersection(region, clip)
-
-            for y, strip in zip(render_region.line_range, strips):
-                if not is_rendered_line(y):
+        for (render_x, render_y, render_width, render_height), strips in renders:
+            line_range: Iterable[int] = range(
+                render_y, render_y + min(len(strips), render_height)
+            )
+            if rendered_lines is not None:
+                # Skip widgets which don't cover any of the rendered lines
+                line_range = rendered_lines.intersection(line_range)
+                if not line_range:
                     continue
 
+            first_cut = render_x
+            last_cut = render_x + render_width
+            previous_cuts: tuple[int, ...] | None = None
+            first_index = 0
+            has_width = False
+            relative_cuts: tuple[int, ...] | None = None
+
+            for y in line_range:
+                strip = strips[y - render_y]
                 chops_line = chops[y]
 
-                first_cut, last_cut = render_region.column_span
                 cuts_line = cuts[y]
-                final_cuts = [
-                    cut for cut in cuts_line if (last_cut >= cut >= first_cut)
-                ]
-                if len(final_cuts) <= 2:
-                    # Two cuts, which means the entire line
-                    cut_strips = [strip]
-                else:
-                    render_x = render_region.x
-                    relative_cuts = [cut - render_x for cut in final_cuts[1:]]
-                    cut_strips = strip.divide(relative_cuts)
+                # Lines often share the same cuts, so the cuts for the widget can be reused
+                if cuts_line is not previous_cuts:
+                    previous_cuts = cuts_line
+                    if first_cut <= cuts_line[0] and last_cut >= cuts_line[-1]:
+                        # The widget covers the entire line
+                        first_index = 0
+                        final_cuts = cuts_line
+                    else:
+                        # Cuts are sorted, so the cuts within the widget are a slice
+                        first_index = _bisect_left(cuts_line, first_cut)
+                        final_cuts = cuts_line[
+                            first_index : _bisect_right(cuts_line, last_cut)
+                        ]
+                    has_width = len(final_cuts) >= 2
+                    relative_cuts = (
+                        tuple([cut - render_x for cut in final_cuts[1:]])
+                        if len(final_cuts) > 2
+                        else None
+                    )
 
+                if not has_width:
+                    # The widget has no width on this line
+                    continue
                 # Since we are painting front to back, the first segments for a cut "wins"
-                for cut, strip in zip(final_cuts, cut_strips):
-                    if chops_line[cut] is None:
-                        chops_line[cut] = strip
+                if relative_cuts is None:
+                    # Two cuts, which means the strip fills a single chop
+                    if chops_line[first_index] is None:
+                        chops_line[first_index] = strip
+                else:
+                    for index, strip in enumerate(
+                        strip.divide(relative_cuts), first_index
+                    ):
+                        if chops_line[index] is None:
+                            chops_line[index] = strip
 
         return chops
 
@@ -936,22 +1468,55 @@ class Compositor:
             widgets: Set of Widgets to update.
 
         """
+        visible_widgets = self.visible_widgets
+        updated_widgets = visible_widgets.keys() & widgets
         # If there are any *new* widgets we need to invalidate the full map
-        if not self._full_map_invalidated and not widgets.issubset(
-            self.visible_widgets.keys()
-        ):
+        if len(updated_widgets) != len(widgets):
             self._full_map_invalidated = True
 
         regions: list[Region] = []
-        add_region = regions.append
-        get_widget = self.visible_widgets.__getitem__
-        for widget in self.visible_widgets.keys() & widgets:
+        add_regions = regions.extend
+        get_widget = visible_widgets.__getitem__
+        update_regions_cache = self._update_regions_cache
+        translate = Region.translate
+        for widget in updated_widgets:
             region, clip = get_widget(widget)
-            offset = region.offset
-            intersection = clip.intersection
-            for dirty_region in widget._exchange_repaint_regions():
-                update_region = intersection(dirty_region.translate(offset))
-                if update_region:
-                    add_region(update_region)
-
-        self._dirty_regions.update(regions)
+            repaint_regions = widget._exchange_repaint_regions()
+            # Widgets which refresh periodically tend to repaint the same regions
+            cached = update_regions_cache.get(widget)
+            if (
+                cached is not None
+                and cached[0] == region
+                and cached[1] == clip
+                and cached[2] == repaint_regions
+            ):
+                add_regions(cached[3])
+                continue
+            # Translate to screen space, clip, and drop empty regions
+            widget_regions = list(
+                filter(
+                    None,
+                    map(
+                        clip.intersection,
+                        map(translate, repaint_regions, repeat(region.offset)),
+                    ),
+                )
+            )
+            update_regions_cache[widget] = (
+                region,
+                clip,
+                repaint_regions,
+                widget_regions,
+            )
+            add_regions(widget_regions)
+
+        if len(regions) > 1:
+            # Merge stacked regions (e.g. from animated widgets) before storing them.
+            # Everything else is coalesced once, in render_partial_update.
+            self._dirty_regions.update(self._merge_vertical_regions(regions))
+        else:
+            self._dirty_regions.update(regions)
+
+        # The widget under the mouse may have changed its content
+        if self._style_line is not None and self._style_line[0] in widgets:
+            self._style_line = None
@@ -762,6 +762,36 @@ class Region(NamedTuple):
 
         return Region(rx1, ry1, rx2 - rx1, ry2 - ry1)
 
+    @lru_cache(maxsize=4096)
+    def clip_crop(self, clip: Region) -> tuple[Region, Region]:
+        """Clip this region, and get the part of it which remains visible.
+
+        Args:
+            clip: A region to clip to.
+
+        Returns:
+            A tuple of the clipped region, and the clipped region relative to this region.
+        """
+        # Unrolled equivalent of `self.intersection(clip)`
+        x1, y1, w1, h1 = self
+        cx1, cy1, w2, h2 = clip
+        x2 = x1 + w1
+        y2 = y1 + h1
+        cx2 = cx1 + w2
+        cy2 = cy1 + h2
+
+        rx1 = cx2 if x1 > cx2 else (cx1 if x1 < cx1 else x1)
+        ry1 = cy2 if y1 > cy2 else (cy1 if y1 < cy1 else y1)
+        rx2 = cx2 if x2 > cx2 else (cx1 if x2 < cx1 else x2)
+        ry2 = cy2 if y2 > cy2 else (cy1 if y2 < cy1 else y2)
+
+        width = rx2 - rx1
+        height = ry2 - ry1
+        return (
+            Region(rx1, ry1, width, height),
+            Region(rx1 - x1, ry1 - y1, width, height),
+        )
+
     @lru_cache(maxsize=4096)
     def union(self, region: Region) -> Region:
         """Get the smallest region that contains both regions.
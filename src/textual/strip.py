@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from itertools import chain
+from itertools import accumulate, chain
 from typing import Iterable, Iterator
 
 import rich.repr
@@ -61,6 +61,7 @@ class Strip:
         "_crop_cache",
         "_style_cache",
         "_link_ids",
+        "_segment_ends",
     ]
 
     def __init__(
@@ -72,6 +73,7 @@ class Strip:
         self._crop_cache: FIFOCache[tuple[int, int], Strip] = FIFOCache(4)
         self._style_cache: FIFOCache[Style, Strip] = FIFOCache(4)
         self._link_ids: set[str] | None = None
+        self._segment_ends: list[int] | None = None
 
         if DEBUG and cell_length is not None:
             # If `cell_length` is incorrect, render will be fubar
@@ -145,6 +147,29 @@ class Strip:
             self._cell_length = get_line_length(self._segments)
         return self._cell_length
 
+    @property
+    def segment_ends(self) -> list[int]:
+        """The cell position of the end of each segment."""
+        # Done on demand and cached, as this is an O(n) operation
+        if self._segment_ends is None:
+            segments = self._segments
+            if len(segments) == 1 and self._cell_length is not None:
+                # Single segment strips (e.g. blanks) were measured on construction
+                self._segment_ends = [0 if segments[0].control else self._cell_length]
+            else:
+                _cell_len = cell_len
+                self._segment_ends = list(
+                    accumulate(
+                        0 if control else _cell_len(text)
+                        for text, _, control in segments
+                    )
+                )
+                if self._cell_length is None:
+                    self._cell_length = (
+                        self._segment_ends[-1] if self._segment_ends else 0
+                    )
+        return self._segment_ends
+
     @classmethod
     def join(cls, strips: Iterable[Strip | None]) -> Strip:
         """Join a number of strips in to one.
@@ -178,6 +203,9 @@ class Strip:
     def __len__(self) -> int:
         return len(self._segments)
 
+    def __getitem__(self, index: int) -> Segment:
+        return self._segments[index]
+
     def __eq__(self, strip: object) -> bool:
         return isinstance(strip, Strip) and (
             self._segments == strip._segments and self.cell_length == strip.cell_length
@@ -359,14 +387,14 @@ class Strip:
         """
 
         pos = 0
-        cache_key = tuple(cuts)
+        cache_key = cuts if isinstance(cuts, tuple) else tuple(cuts)
         cached = self._divide_cache.get(cache_key)
         if cached is not None:
             return cached
 
         strips: list[Strip] = []
         add_strip = strips.append
-        for segments, cut in zip(Segment.divide(self._segments, cuts), cuts):
+        for segments, cut in zip(Segment.divide(self._segments, cache_key), cache_key):
             add_strip(Strip(segments, cut - pos))
             pos = cut
 
@@ -0,0 +1,102 @@
+from rich.console import Console
+from rich.control import Control
+from rich.segment import Segment
+
+from textual._compositor import ChopsUpdate
+from textual.strip import Strip
+
+
+def render_chops_update(chops_update: ChopsUpdate) -> list[Segment]:
+    """Render a ChopsUpdate, replacing controls with their segments."""
+    console = Console(width=20, force_terminal=True)
+    return [
+        item.segment if isinstance(item, Control) else item
+        for item in chops_update.__rich_console__(console, console.options)
+    ]
+
+
+def move_to(x: int, y: int) -> Segment:
+    return Control.move_to(x, y).segment
+
+
+CHOPS = [
+    [
+        Strip([Segment("ab"), Segment("cde")]),
+        Strip([Segment("fghij")]),
+    ]
+]
+CHOP_ENDS = [(5, 10)]
+
+
+def test_chops_update_whole_chops():
+    chops_update = ChopsUpdate(CHOPS, [(0, 0, 10)], CHOP_ENDS)
+    assert render_chops_update(chops_update) == [
+        move_to(0, 0),
+        Segment("ab"),
+        Segment("cde"),
+        move_to(5, 0),
+        Segment("fghij"),
+    ]
+
+
+def test_chops_update_span_within_segments():
+    """Spans starting or ending mid-segment include the overlapping segments."""
+    chops_update = ChopsUpdate(CHOPS, [(0, 3, 7)], CHOP_ENDS)
+    assert render_chops_update(chops_update) == [
+        move_to(2, 0),
+        Segment("cde"),
+        move_to(5, 0),
+        Segment("fghij"),
+    ]
+
+
+def test_chops_update_span_ends_at_chop():
+    """A chop starting exactly at the end of the span isn't rendered."""
+    chops_update = ChopsUpdate(CHOPS, [(0, 1, 5)], CHOP_ENDS)
+    assert render_chops_update(chops_update) == [
+        move_to(0, 0),
+        Segment("ab"),
+        Segment("cde"),
+    ]
+
+
+def test_chops_update_skips_empty_chops():
+    chops_update = ChopsUpdate([[None, CHOPS[0][1]]], [(0, 0, 10)], CHOP_ENDS)
+    assert render_chops_update(chops_update) == [
+        move_to(5, 0),
+        Segment("fghij"),
+    ]
+
+
+def test_chops_update_trailing_zero_width_segments():
+    """Zero width segments at the end of a chop are kept if the chop ends in the span."""
+    chops = [
+        [
+            Strip([Segment("ab"), Segment("cde"), Segment("")]),
+            Strip([Segment("fg"), Segment(""), Segment("hij")]),
+        ]
+    ]
+    chops_update = ChopsUpdate(chops, [(0, 3, 5)], CHOP_ENDS)
+    assert render_chops_update(chops_update) == [
+        move_to(2, 0),
+        Segment("cde"),
+        Segment(""),
+    ]
+
+    chops_update = ChopsUpdate(chops, [(0, 6, 7)], CHOP_ENDS)
+    assert render_chops_update(chops_update) == [
+        move_to(5, 0),
+        Segment("fg"),
+    ]
+
+
+def test_chops_update_multiple_lines():
+    chops = [[Strip([Segment("abc")])], [Strip([Segment("def")])]]
+    chops_update = ChopsUpdate(chops, [(0, 0, 3), (1, 1, 2)], [(3,), (3,)])
+    assert render_chops_update(chops_update) == [
+        move_to(0, 0),
+        Segment("abc"),
+        Segment.line(),
+        move_to(0, 1),
+        Segment("def"),
+    ]
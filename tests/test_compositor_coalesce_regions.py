@@ -0,0 +1,70 @@
+from textual._compositor import Compositor
+from textual.geometry import Region
+
+
+def test_coalesce_regions_no_regions():
+    assert Compositor._coalesce_regions([]) == []
+
+
+def test_coalesce_regions_single_region():
+    assert Compositor._coalesce_regions([Region(1, 2, 3, 4)]) == [Region(1, 2, 3, 4)]
+
+
+def test_coalesce_regions_vertically_adjacent():
+    regions = [Region(0, 2, 5, 2), Region(0, 0, 5, 2)]
+    assert Compositor._coalesce_regions(regions) == [Region(0, 0, 5, 4)]
+
+
+def test_coalesce_regions_horizontally_adjacent():
+    regions = [Region(0, 0, 5, 2), Region(5, 0, 5, 2)]
+    assert Compositor._coalesce_regions(regions) == [Region(0, 0, 10, 2)]
+
+
+def test_coalesce_regions_contained():
+    regions = [Region(0, 0, 10, 10), Region(2, 2, 3, 3)]
+    assert Compositor._coalesce_regions(regions) == [Region(0, 0, 10, 10)]
+
+
+def test_coalesce_regions_disjoint():
+    regions = [Region(0, 0, 2, 2), Region(5, 5, 2, 2)]
+    assert Compositor._coalesce_regions(regions) == regions
+
+
+def test_coalesce_regions_too_much_extra_area():
+    # A union of these regions would cover much more area than the originals
+    regions = [Region(0, 0, 10, 1), Region(9, 1, 1, 10)]
+    assert Compositor._coalesce_regions(regions) == regions
+
+
+def test_coalesce_regions_staggered_rows():
+    # Each merge is within 25% of the last, but the overall union would not be
+    regions = [Region(2 * index, index, 10, 1) for index in range(20)]
+    coalesced = Compositor._coalesce_regions(regions)
+    assert sum(region.area for region in coalesced) * 4 <= 200 * 5
+    assert Region.from_union(coalesced) == Region.from_union(regions)
+
+    regions = [Region(0, index, 1 + index, 1) for index in range(30)]
+    coalesced = Compositor._coalesce_regions(regions)
+    assert sum(region.area for region in coalesced) * 4 <= 465 * 5
+
+
+def test_merge_vertical_regions():
+    regions = [
+        Region(0, 4, 5, 2),
+        Region(0, 0, 5, 2),
+        Region(0, 2, 5, 3),
+        Region(0, 8, 5, 1),
+        Region(1, 9, 5, 1),
+        Region(0, 9, 4, 1),
+    ]
+    assert Compositor._merge_vertical_regions(regions) == [
+        Region(0, 9, 4, 1),
+        Region(0, 0, 5, 6),
+        Region(0, 8, 5, 1),
+        Region(1, 9, 5, 1),
+    ]
+
+
+def test_merge_vertical_regions_same_area():
+    regions = [Region(2 * i, i, 10, 1) for i in range(20)]
+    assert Compositor._merge_vertical_regions(regions) == regions
@@ -0,0 +1,128 @@
+from textual.app import App, ComposeResult
+from textual.containers import Horizontal, VerticalScroll
+from textual.widgets import Static
+
+
+class ScrollApp(App):
+    CSS = """
+    Static {
+        height: 3;
+    }
+    #inner {
+        height: 8;
+    }
+    #offset {
+        offset: 2 1;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        with Horizontal():
+            with VerticalScroll(id="a"):
+                for index in range(10):
+                    yield Static(f"a{index}")
+                with VerticalScroll(id="inner"):
+                    for index in range(10):
+                        yield Static(
+                            f"inner{index}", id="offset" if index == 3 else None
+                        )
+                for index in range(10):
+                    yield Static(f"a{index + 10}")
+            with VerticalScroll(id="b"):
+                for index in range(20):
+                    yield Static(f"b{index}", id=f"b{index}")
+
+
+async def test_full_map_after_scroll():
+    """Scrolled containers are re-arranged in the full map."""
+    app = ScrollApp()
+    async with app.run_test(size=(40, 20)) as pilot:
+        await pilot.pause()
+        screen = app.screen
+        compositor = screen._compositor
+        compositor.full_map
+
+        for selector, scroll_y in [("#a", 12), ("#inner", 5), ("#a", 8), ("#b", 9)]:
+            app.query_one(selector).scroll_to(y=scroll_y, animate=False)
+            compositor.reflow_visible(screen, compositor.size)
+            assert compositor._full_map_scrolled
+            full_map = dict(compositor.full_map)
+            expected_map, _, _ = compositor._arrange_root(
+                screen, compositor.size, visible_only=False
+            )
+            assert full_map == expected_map
+
+
+async def test_full_map_after_scroll_and_reflow():
+    """A reflow after a scroll doesn't leave an incomplete full map."""
+    app = ScrollApp()
+    async with app.run_test(size=(40, 20)) as pilot:
+        await pilot.pause()
+        screen = app.screen
+        compositor = screen._compositor
+        compositor.full_map
+
+        app.query_one("#a").scroll_to(y=10, animate=False)
+        compositor.reflow_visible(screen, compositor.size)
+        compositor.reflow(screen, compositor.size)
+        assert app.query_one("#b19") in compositor.full_map
+
+
+async def test_full_map_after_reflow_and_scroll():
+    """A scroll after a reflow doesn't update the (visible only) map incrementally."""
+    app = ScrollApp()
+    async with app.run_test(size=(40, 20)) as pilot:
+        await pilot.pause()
+        screen = app.screen
+        compositor = screen._compositor
+        compositor.full_map
+
+        compositor.reflow(screen, compositor.size)
+        app.query_one("#a").scroll_to(y=10, animate=False)
+        compositor.reflow_visible(screen, compositor.size)
+        assert app.query_one("#b19") in compositor.full_map
+
+
+class HiddenScrollApp(App):
+    CSS = """
+    #container.hidden {
+        visibility: hidden;
+    }
+    #container Static {
+        height: 3;
+    }
+    #shown {
+        visibility: visible;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        with VerticalScroll(id="container"):
+            for index in range(10):
+                yield Static(f"h{index}", id="shown" if index == 5 else None)
+
+
+async def test_full_map_after_scroll_hidden_container():
+    """A hidden container with a visible child is re-arranged when it scrolls."""
+    app = HiddenScrollApp()
+    async with app.run_test(size=(40, 10)) as pilot:
+        await pilot.pause()
+        screen = app.screen
+        compositor = screen._compositor
+        container = app.query_one("#container")
+        shown = app.query_one("#shown")
+        # The container keeps its virtual size, so it can still be scrolled
+        container.add_class("hidden")
+        await pilot.pause()
+        assert container not in compositor.full_map
+        assert shown in compositor.full_map
+
+        container.scroll_y = 12
+        compositor.reflow_visible(screen, compositor.size)
+        assert compositor._full_map_scrolled
+        full_map = dict(compositor.full_map)
+        expected_map, _, _ = compositor._arrange_root(
+            screen, compositor.size, visible_only=False
+        )
+        assert full_map == expected_map
+        assert full_map[shown].region.y == 3
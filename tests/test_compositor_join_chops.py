@@ -0,0 +1,25 @@
+from rich.segment import Segment
+
+from textual._compositor import Compositor
+from textual.strip import Strip
+
+
+def test_join_chops_unchanged():
+    """Lines with the same strips reuse the joined strip."""
+    compositor = Compositor()
+    chops = [[Strip([Segment("foo")]), Strip([Segment("bar")])]]
+    (joined,) = compositor._join_chops(chops)
+    assert joined.text == "foobar"
+    assert compositor._join_chops(chops)[0] is joined
+    assert compositor._join_chops([list(chops[0])])[0] is joined
+
+
+def test_join_chops_replaced_strip():
+    """A line with a replaced strip is joined again."""
+    compositor = Compositor()
+    strip = Strip([Segment("foo")])
+    (joined,) = compositor._join_chops([[strip, Strip([Segment("bar")])]])
+    (new_joined,) = compositor._join_chops([[strip, Strip([Segment("baz")])]])
+    assert new_joined is not joined
+    assert new_joined.text == "foobaz"
+    assert joined.text == "foobar"
@@ -0,0 +1,54 @@
+from textual._compositor import ReflowResult
+from textual.app import App, ComposeResult
+from textual.geometry import Size
+from textual.widgets import Static
+
+
+class ReflowApp(App):
+    CSS = """
+    Static {
+        height: 1fr;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        yield Static("foo", id="foo")
+        yield Static("bar", id="bar")
+
+
+async def test_reflow_unchanged():
+    """Reflowing again at the same size changes nothing, so there is nothing to render."""
+    app = ReflowApp()
+    async with app.run_test(size=(20, 10)) as pilot:
+        await pilot.pause()
+        screen = app.screen
+        compositor = screen._compositor
+        compositor.reflow(screen, compositor.size)
+        compositor.render_update(full=True)
+
+        assert compositor.reflow(screen, compositor.size) == ReflowResult(
+            set(), set(), set()
+        )
+        assert not compositor._dirty_regions
+        assert compositor.render_update() is None
+
+
+async def test_reflow_resized():
+    """Reflowing at a new size re-arranges the widgets."""
+    app = ReflowApp()
+    async with app.run_test(size=(20, 10)) as pilot:
+        await pilot.pause()
+        screen = app.screen
+        compositor = screen._compositor
+        compositor.reflow(screen, compositor.size)
+        compositor.render_update(full=True)
+
+        foo = app.query_one("#foo")
+        bar = app.query_one("#bar")
+        result = compositor.reflow(screen, Size(30, 20))
+        assert {foo, bar} <= result.resized
+        assert not result.hidden
+        assert not result.shown
+        assert compositor.full_map[bar].region.y == 10
+        assert compositor._dirty_regions
+        assert compositor.render_update() is not None
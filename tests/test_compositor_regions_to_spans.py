@@ -52,3 +52,23 @@ def test_regions_to_ranges_directly_adjacent_ranges_merged():
         (0, 0, 2),
         (1, 0, 2),
     ]
+
+
+def test_regions_to_ranges_unordered_regions():
+    regions = [Region(4, 1, 2, 1), Region(0, 0, 2, 2), Region(1, 1, 4, 1)]
+    assert list(Compositor._regions_to_spans(regions)) == [
+        (0, 0, 2),
+        (1, 0, 6),
+    ]
+
+
+def test_regions_to_ranges_staggered_regions():
+    regions = [Region(0, 0, 2, 3), Region(4, 1, 2, 3), Region(0, 1, 2, 1)]
+    assert list(Compositor._regions_to_spans(regions)) == [
+        (0, 0, 2),
+        (1, 0, 2),
+        (1, 4, 6),
+        (2, 0, 2),
+        (2, 4, 6),
+        (3, 4, 6),
+    ]
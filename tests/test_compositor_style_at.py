@@ -0,0 +1,28 @@
+from textual.app import App, ComposeResult
+from textual.widgets import Label
+
+
+class LabelApp(App):
+    def compose(self) -> ComposeResult:
+        yield Label("Hello, World")
+
+
+async def test_get_style_at():
+    app = LabelApp()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        compositor = app.screen._compositor
+        assert not compositor.get_style_at(0, 0).bold
+        # The cached line is reused for the same widget and line
+        assert not compositor.get_style_at(1, 0).bold
+
+
+async def test_get_style_at_after_update():
+    """The style reflects a widget's content as soon as it is updated."""
+    app = LabelApp()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        compositor = app.screen._compositor
+        assert not compositor.get_style_at(0, 0).bold
+        app.query_one(Label).update("[bold]Hello, World[/]")
+        assert compositor.get_style_at(0, 0).bold
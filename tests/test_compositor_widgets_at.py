@@ -0,0 +1,40 @@
+import pytest
+
+from textual import errors
+from textual.app import App, ComposeResult
+from textual.widgets import Static
+
+
+class OffsetApp(App):
+    CSS = """
+    Static {
+        height: 4;
+    }
+    #up {
+        offset: 0 -2;
+    }
+    #down {
+        dock: bottom;
+        offset: 0 2;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        yield Static("up", id="up")
+        yield Static("down", id="down")
+
+
+async def test_get_widgets_at_off_screen():
+    """Lines above or below the screen have no widgets, even if widgets extend there."""
+    app = OffsetApp()
+    async with app.run_test(size=(20, 10)) as pilot:
+        await pilot.pause()
+        compositor = app.screen._compositor
+        assert compositor.get_widget_at(0, 0)[0] is app.query_one("#up")
+        assert compositor.get_widget_at(0, 9)[0] is app.query_one("#down")
+
+        for y in (-1, -2, 10, 11, 100):
+            assert list(compositor.get_widgets_at(0, y)) == []
+            assert compositor._get_layers_at_line(y) == []
+            with pytest.raises(errors.NoWidget):
+                compositor.get_widget_at(0, y)
@@ -279,6 +279,20 @@ def test_region_intersection():
     assert not Region(10, 10, 20, 30).intersection(Region(50, 50, 100, 200))
 
 
+def test_region_clip_crop():
+    assert Region(10, 10, 20, 5).clip_crop(Region(0, 0, 100, 50)) == (
+        Region(10, 10, 20, 5),
+        Region(0, 0, 20, 5),
+    )
+    assert Region(10, 10, 30, 20).clip_crop(Region(20, 15, 60, 40)) == (
+        Region(20, 15, 20, 15),
+        Region(10, 5, 20, 15),
+    )
+    clipped, crop = Region(10, 10, 20, 30).clip_crop(Region(50, 50, 100, 200))
+    assert not clipped
+    assert not crop
+
+
 def test_region_union():
     assert Region(5, 5, 10, 10).union(Region(20, 30, 10, 5)) == Region(5, 5, 25, 30)
 
@@ -19,6 +19,14 @@ def test_repr() -> None:
     assert repr(strip) == "Strip([Segment('foo')], 3)"
 
 
+def test_segment_ends() -> None:
+    strip = Strip([Segment("foo"), Segment("💩"), Segment("bar")])
+    assert strip.segment_ends == [3, 5, 8]
+    assert Strip([]).segment_ends == []
+    assert Strip.blank(5).segment_ends == [5]
+    assert strip.cell_length == 8
+
+
 def test_join() -> None:
     strip1 = Strip([Segment("foo")])
     strip2 = Strip([Segment("bar")])
@@ -48,6 +56,12 @@ def test_len():
     assert len(Strip([Segment("foo"), Segment("bar")])) == 2
 
 
+def test_getitem():
+    strip = Strip([Segment("foo"), Segment("bar")])
+    assert strip[0] == Segment("foo")
+    assert strip[-1] == Segment("bar")
+
+
 def test_reversed():
     assert list(reversed(Strip([]))) == []
     assert list(reversed(Strip([Segment("foo")]))) == [Segment("foo")]
@@ -149,6 +163,13 @@ def test_divide():
         ]
 
 
+def test_divide_cached():
+    strip = Strip([Segment("foo")])
+    strips = strip.divide((1, 2))
+    assert strip.divide([1, 2]) is strips
+    assert strip.divide(iter([1, 2])) is strips
+
+
 @pytest.mark.parametrize(
     "index,cell_position",
     [